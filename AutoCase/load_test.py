@@ -0,0 +1,417 @@
+"""
+AutoCase Load Test - Concurrent Upload Harness
+
+Replays N concurrent generation jobs against test_case_generator.py the same
+way upload.php does (one `python test_case_generator.py <file>` process per
+upload) using locally generated CSV/XLSX/DOCX fixtures.
+
+Usage:
+    python load_test.py --levels 1 2 4 8 --jobs 16
+    python load_test.py --levels 4 --isolate --report outputs/load_test.csv
+"""
+import argparse
+import csv
+import math
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import docx
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATOR_SCRIPT = os.path.join(SCRIPT_DIR, "test_case_generator.py")
+COUNT_DELIMITER = "---TEST_CASE_COUNT_DELIMITER---"
+EXPECTED_COLUMNS = [
+    'test_id', 'requirement_id', 'test_name', 'test_description', 'test_category',
+    'priority', 'preconditions', 'test_steps', 'expected_result', 'confidence_score'
+]
+
+# Fixture sizes (number of requirements per file)
+FIXTURE_SIZES = {'small': 10, 'medium': 50, 'large': 200}
+FIXTURE_FORMATS = ['csv', 'xlsx', 'docx']
+
+REQUIREMENT_TEMPLATES = [
+    "The system shall allow users to {verb} their {noun}",
+    "The user should be able to {verb} the {noun} from the dashboard",
+    "The system shall require login before users can {verb} the {noun}",
+    "The system shall display an error message when an invalid {noun} is submitted",
+    "The {noun} field shall accept a maximum of 255 characters",
+    "The system shall {verb} the {noun} within 2 seconds under concurrent load",
+    "The administrator shall be able to {verb} {noun} permissions for other users",
+    "When the session expires, the system shall {verb} the {noun} automatically",
+]
+VERBS = ['create', 'update', 'delete', 'upload', 'search', 'export', 'review', 'approve']
+# One noun per fixture, used in every requirement of that fixture only. It ends up
+# in the generated test cases, so an output holding another fixture's noun was
+# overwritten by a concurrent job.
+FIXTURE_NOUNS = ['voucher', 'ledger', 'shipment', 'ticket', 'playlist', 'coupon', 'timesheet', 'warehouse', 'invoice']
+CONTENT_COLUMNS = ['test_description', 'preconditions', 'test_steps', 'expected_result']
+MEMORY_SAMPLE_INTERVAL = 0.05   # seconds
+
+try:
+    import resource   # POSIX only: per-job CPU time and peak RSS
+except ImportError:
+    resource = None
+
+try:
+    import psutil   # optional: combined RSS sampling on any platform
+except ImportError:
+    psutil = None
+
+
+# ===============================
+# FIXTURES
+# ===============================
+
+def build_requirements(count, noun, seed):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        template = REQUIREMENT_TEMPLATES[i % len(REQUIREMENT_TEMPLATES)]
+        rows.append({
+            "requirement_id": f"R{i+1}",
+            "requirement_text": template.format(verb=rng.choice(VERBS), noun=noun),
+            "priority": rng.choice(['High', 'Medium', 'Low']),
+            "category": "general"
+        })
+    return pd.DataFrame(rows)
+
+
+def create_fixtures(fixtures_dir):
+    """Write one fixture per size/format combination and return (path, requirement_count, noun) tuples."""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    fixtures = []
+    nouns = iter(FIXTURE_NOUNS)
+    for size_name, count in FIXTURE_SIZES.items():
+        for fmt in FIXTURE_FORMATS:
+            noun = next(nouns)
+            df = build_requirements(count, noun, seed=count)
+            path = os.path.join(fixtures_dir, f"requirements_{size_name}.{fmt}")
+            if fmt == 'csv':
+                df.to_csv(path, index=False)
+            elif fmt == 'xlsx':
+                df.to_excel(path, index=False)
+            else:
+                document = docx.Document()
+                for _, row in df.iterrows():
+                    document.add_paragraph(f"{row['requirement_id']}: {row['requirement_text']}")
+                document.save(path)
+            fixtures.append((path, count, noun))
+    return fixtures
+
+
+# ===============================
+# JOB EXECUTION
+# ===============================
+
+def verify_output(output_csv, reported_count, expected_requirements, own_noun):
+    """Return a list of problems found in a job's generated CSV (empty list = clean)."""
+    if not os.path.exists(output_csv):
+        return ["output CSV missing"]
+    try:
+        with open(output_csv, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+            header = reader.fieldnames or []
+    except Exception as e:
+        return [f"output CSV unreadable: {e}"]
+
+    problems = []
+    if header != EXPECTED_COLUMNS:
+        problems.append("unexpected header")
+    if reported_count is None:
+        problems.append("no test case count in script output")
+    elif len(rows) != reported_count:
+        problems.append(f"{len(rows)} rows on disk but script reported {reported_count}")
+    if any(None in row or any(v is None for v in row.values()) for row in rows):
+        problems.append("truncated or malformed rows")
+    requirement_ids = {row.get('requirement_id') for row in rows}
+    if len(requirement_ids) != expected_requirements:
+        problems.append(f"covers {len(requirement_ids)} requirements, expected {expected_requirements}")
+
+    # Content check: the test cases must mention this job's fixture noun and no other
+    content = " ".join(row.get(col) or '' for row in rows for col in CONTENT_COLUMNS).lower()
+    found = {noun for noun in FIXTURE_NOUNS if re.search(rf"\b{noun}", content)}
+    foreign = sorted(found - {own_noun})
+    if foreign:
+        problems.append(f"contains test cases from other fixtures ({', '.join(foreign)})")
+    elif own_noun not in found:
+        problems.append(f"no test case mentions this fixture's '{own_noun}' requirements")
+    return problems
+
+
+def parse_count(output):
+    lines = output.splitlines()
+    for i, line in enumerate(lines):
+        if line.strip() == COUNT_DELIMITER and i + 1 < len(lines):
+            try:
+                return int(lines[i + 1].strip())
+            except ValueError:
+                return None
+    return None
+
+
+def read_rss_mb(pid):
+    """Current resident memory of a process in MB (0.0 if it has already exited)."""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+        except psutil.Error:
+            return 0.0
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024   # value is in kB
+    except OSError:
+        pass
+    return 0.0
+
+
+def memory_sampling_available():
+    return psutil is not None or os.path.exists("/proc/self/status")
+
+
+def maxrss_to_mb(maxrss):
+    """ru_maxrss is reported in bytes on macOS and in kilobytes on Linux/BSD."""
+    if sys.platform == 'darwin':
+        return maxrss / (1024 * 1024)
+    return maxrss / 1024
+
+
+class MemoryMonitor:
+    """Sample the combined RSS of all running generator processes from a background thread."""
+
+    def __init__(self, interval=MEMORY_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._pids = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def register(self, pid):
+        with self._lock:
+            self._pids.add(pid)
+
+    def unregister(self, pid):
+        with self._lock:
+            self._pids.discard(pid)
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                pids = list(self._pids)
+            total = sum(read_rss_mb(pid) for pid in pids)
+            self.peak_mb = max(self.peak_mb, total)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_job(job_id, fixture, work_dir, python_executable, monitor=None):
+    """Run one generator process like upload.php and measure it."""
+    fixture_path, expected_requirements, own_noun = fixture
+    os.makedirs(work_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [python_executable, GENERATOR_SCRIPT, fixture_path],
+        cwd=work_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    )
+    if monitor is not None:
+        monitor.register(proc.pid)
+    output = proc.stdout.read().decode('utf-8', errors='replace')
+    proc.stdout.close()
+    if monitor is not None:
+        monitor.unregister(proc.pid)
+
+    cpu_seconds = None
+    peak_rss_mb = None
+    if resource is not None:
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        cpu_seconds = usage.ru_utime + usage.ru_stime
+        peak_rss_mb = maxrss_to_mb(usage.ru_maxrss)
+    else:
+        proc.wait()
+    latency = time.perf_counter() - start
+
+    # Read the output immediately, as upload.php does after shell_exec returns
+    reported_count = parse_count(output)
+    problems = []
+    if proc.returncode != 0:
+        problems.append(f"exit code {proc.returncode}")
+    problems += verify_output(
+        os.path.join(work_dir, "outputs", "generated_test_cases.csv"),
+        reported_count, expected_requirements, own_noun
+    )
+
+    return {
+        'job_id': job_id,
+        'fixture': os.path.basename(fixture_path),
+        'latency': latency,
+        'cpu_seconds': cpu_seconds,
+        'peak_rss_mb': peak_rss_mb,
+        'ok': proc.returncode == 0,
+        'corrupted': proc.returncode == 0 and bool(problems),
+        'problems': "; ".join(problems)
+    }
+
+
+# ===============================
+# METRICS
+# ===============================
+
+def percentile(values, pct):
+    """Nearest-rank percentile (None when no job succeeded)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def round_or_none(value, digits=2):
+    return round(value, digits) if value is not None else None
+
+
+def run_level(concurrency, jobs, fixtures, base_dir, isolate, python_executable):
+    """Run `jobs` generator processes with at most `concurrency` running at once."""
+    shared_dir = os.path.join(base_dir, f"level_{concurrency}")
+    schedule = [fixtures[i % len(fixtures)] for i in range(jobs)]
+    lock = threading.Lock()
+    results = []
+    monitor = MemoryMonitor() if memory_sampling_available() else None
+
+    def worker(job_id, fixture):
+        work_dir = os.path.join(shared_dir, f"job_{job_id}") if isolate else shared_dir
+        result = run_job(job_id, fixture, work_dir, python_executable, monitor)
+        with lock:
+            results.append(result)
+            status = "CORRUPTED" if result['corrupted'] else ("ok" if result['ok'] else "FAILED")
+            print(f"   job {job_id:>3} {result['fixture']:<28} {result['latency']:7.2f}s  {status}")
+            if result['problems']:
+                print(f"       ↳ {result['problems']}")
+
+    if monitor is not None:
+        monitor.start()
+    wall_start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(worker, job_id, fixture) for job_id, fixture in enumerate(schedule, start=1)]
+            for future in futures:
+                future.result()
+    finally:
+        if monitor is not None:
+            monitor.stop()
+    wall = time.perf_counter() - wall_start
+
+    latencies = [r['latency'] for r in results if r['ok']]
+    cpu_values = [r['cpu_seconds'] for r in results if r['cpu_seconds'] is not None]
+    rss_values = [r['peak_rss_mb'] for r in results if r['peak_rss_mb'] is not None]
+    cpu_count = os.cpu_count() or 1
+
+    return {
+        'concurrency': concurrency,
+        'jobs': jobs,
+        'succeeded': len(latencies),
+        'failed': sum(1 for r in results if not r['ok']),
+        'corrupted': sum(1 for r in results if r['corrupted']),
+        'p50_s': round_or_none(percentile(latencies, 50)),
+        'p95_s': round_or_none(percentile(latencies, 95)),
+        'p99_s': round_or_none(percentile(latencies, 99)),
+        'jobs_per_min': round(len(latencies) / wall * 60, 2) if wall else 0.0,
+        'cpu_util_pct': round(sum(cpu_values) / (wall * cpu_count) * 100, 1) if cpu_values and wall else None,
+        'peak_total_rss_mb': round(monitor.peak_mb, 1) if monitor is not None else None,
+        'peak_job_rss_mb': round(max(rss_values), 1) if rss_values else None,
+        'wall_s': round(wall, 2)
+    }, results
+
+
+# ===============================
+# RUN SCRIPT
+# ===============================
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent upload load test for test_case_generator.py")
+    parser.add_argument("--levels", type=positive_int, nargs="+", default=[1, 2, 4, 8], help="Concurrency levels to test")
+    parser.add_argument("--jobs", type=positive_int, default=None, help="Jobs per level (default: 2 x concurrency, at least 9)")
+    parser.add_argument("--isolate", action="store_true",
+                        help="Give every job its own working directory instead of the shared one upload.php uses")
+    parser.add_argument("--python", default=sys.executable, help="Python executable used to run the generator")
+    parser.add_argument("--report", default=None, help="Optional CSV file for the per-level results")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary fixtures and job outputs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    base_dir = tempfile.mkdtemp(prefix="autocase_load_")
+    print("🚀 Starting AutoCase Load Test")
+    print("=" * 60)
+    print(f"Working directory: {base_dir}")
+    print(f"Mode: {'isolated job directories' if args.isolate else 'shared directory (like upload.php)'}")
+    if resource is None:
+        print("⚠️ Warning: 'resource' module unavailable. CPU and per-job memory metrics will be skipped.")
+    if not memory_sampling_available():
+        print("⚠️ Warning: install psutil to measure combined memory per concurrency level.")
+
+    try:
+        fixtures = create_fixtures(os.path.join(base_dir, "fixtures"))
+        print(f"✅ Created {len(fixtures)} fixtures ({', '.join(FIXTURE_FORMATS)} x {', '.join(FIXTURE_SIZES)})")
+
+        summaries = []
+        for level in args.levels:
+            jobs = args.jobs if args.jobs is not None else max(2 * level, len(fixtures))
+            print(f"\n⚙️ Concurrency {level}: running {jobs} jobs")
+            summary, _ = run_level(level, jobs, fixtures, base_dir, args.isolate, args.python)
+            summaries.append(summary)
+
+        print("\n" + "=" * 60)
+        print("📈 LOAD TEST SUMMARY")
+        print("=" * 60)
+        report = pd.DataFrame(summaries)
+        print(report.to_string(index=False))
+        if args.report:
+            report.to_csv(args.report, index=False)
+            print(f"\nReport saved to {args.report}")
+
+        exit_code = 0
+        if report['failed'].sum() > 0:
+            print(f"\n❌ {report['failed'].sum()} generator job(s) failed. Check the job output above.")
+            exit_code = 1
+        if report['corrupted'].sum() > 0:
+            print("\n❌ Output corruption detected from concurrent writes.")
+            exit_code = 1
+        if exit_code:
+            return exit_code
+        print("\n✅ Load Test Completed. No output corruption detected (row counts and fixture content checked).")
+        return 0
+    finally:
+        if not args.keep:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
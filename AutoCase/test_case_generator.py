@@ -1,9 +1,14 @@
 """
 AI Test Case Generator - Standalone Version WITH DOCX SUPPORT
 """
+import argparse
+import glob
+import multiprocessing
 import random
 import sys
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 import spacy
@@ -25,7 +30,7 @@ warnings.filterwarnings('ignore')
 # DOCX → CSV CONVERTER (NEW)
 # ===============================
 
-def convert_docx_to_csv(docx_path):
+def convert_docx_to_csv(docx_path, out_csv="converted_requirements.csv"):
     print("📄 Converting DOCX → CSV...")
 
     document = docx.Document(docx_path)
@@ -52,12 +57,9 @@ def convert_docx_to_csv(docx_path):
             })
 
     if not rows:
-        print("❌ No valid requirement pattern (R#: text) found in DOCX")
-        sys.exit(1)
+        raise ValueError("No valid requirement pattern (R#: text) found in DOCX")
 
     df = pd.DataFrame(rows)
-
-    out_csv = "converted_requirements.csv"
     df.to_csv(out_csv, index=False)
 
     print("✅ DOCX converted successfully →", out_csv)
@@ -65,36 +67,44 @@ def convert_docx_to_csv(docx_path):
 
 
 # ===============================
-# CHECK INPUT & AUTO-CONVERT DOCX
+# MODEL LOADING (ONCE PER PROCESS)
 # ===============================
 
-if len(sys.argv) < 2:
-    print("❌ Error: No input file provided.")
-    sys.exit(1)
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx', '.xls', '.docx')
+
+nlp = None
+_processor = None
+
+
+def load_nlp():
+    """Download NLTK data and load the spaCy model, only on the first call."""
+    global nlp
+    if nlp is not None:
+        return nlp
 
-input_file = sys.argv[1]
+    # Ensure NLTK data exists
+    nltk.download('punkt', quiet=True)
+    nltk.download('stopwords', quiet=True)
+    nltk.download('averaged_perceptron_tagger', quiet=True)
+    nltk.download('vader_lexicon', quiet=True)
 
-# Auto-detect and convert DOCX
-if input_file.endswith(".docx"):
-    print("📥 DOCX detected. Converting to CSV...")
-    input_file = convert_docx_to_csv(input_file)   # replace path with CSV
+    # Load spaCy model
+    try:
+        nlp = spacy.load("en_core_web_sm")
+    except:
+        from spacy.cli import download
+        download("en_core_web_sm")
+        nlp = spacy.load("en_core_web_sm")
+    return nlp
 
-# Make sure outputs/ exists
-os.makedirs("outputs", exist_ok=True)
 
-# Ensure NLTK data exists
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
-nltk.download('averaged_perceptron_tagger', quiet=True)
-nltk.download('vader_lexicon', quiet=True)
+def get_processor():
+    """Return the shared RequirementsProcessor (spaCy pipeline + Matcher)."""
+    global _processor
+    if _processor is None:
+        _processor = RequirementsProcessor()
+    return _processor
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    from spacy.cli import download
-    download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
 
 # ===============================
 # CLASSES
@@ -104,11 +114,11 @@ class RequirementsProcessor:
     """Process software requirements from CSV/Excel files"""
 
     def __init__(self):
-        self.nlp = nlp
+        self.nlp = load_nlp()
         self.stop_words = set(nltk.corpus.stopwords.words('english'))
         
         # Setup spaCy Matcher
-        self.matcher = Matcher(nlp.vocab)
+        self.matcher = Matcher(self.nlp.vocab)
         
         # Define patterns for "Actor -> Action -> Object"
         self.matcher.add("ACTOR_ACTION_OBJECT", [
@@ -126,9 +136,10 @@ class RequirementsProcessor:
         ])
 
     def load_requirements(self, file_path):
-        if file_path.endswith('.csv'):
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == '.csv':
             df = pd.read_csv(file_path)
-        elif file_path.endswith(('.xlsx', '.xls')):
+        elif extension in ('.xlsx', '.xls'):
             df = pd.read_excel(file_path)
         else:
             raise ValueError("Unsupported file format. Use CSV or Excel.")
@@ -568,22 +579,22 @@ class TestCaseGenerator:
     def calculate_metrics(self, df):
         total_reqs = len(df)
         if total_reqs == 0:
-            return {'requirements_coverage': 0, 'total_test_cases': 0, 'category_distribution': {}}
+            return {'requirements_coverage': 0, 'total_requirements': 0, 'total_test_cases': 0, 'category_distribution': {}}
         covered_reqs = len(set(tc['requirement_id'] for tc in self.test_cases))
         coverage = (covered_reqs / total_reqs) * 100 if total_reqs else 0
         categories = {}
         for tc in self.test_cases:
             cat = tc['test_category']
             categories[cat] = categories.get(cat, 0) + 1
-        return {'requirements_coverage': coverage, 'total_test_cases': len(self.test_cases), 'category_distribution': categories}
+        return {'requirements_coverage': coverage, 'total_requirements': total_reqs, 'total_test_cases': len(self.test_cases), 'category_distribution': categories}
 
 
 # ===============================
 # VISUALIZATION
 # ===============================
 
-def visualize_results(test_cases, metrics):
-    os.makedirs("outputs", exist_ok=True)
+def visualize_results(test_cases, metrics, output_dir="outputs"):
+    os.makedirs(output_dir, exist_ok=True)
     
     # 1. Category distribution
     category_counts = metrics.get('category_distribution', {})
@@ -594,7 +605,7 @@ def visualize_results(test_cases, metrics):
         plt.xlabel('Test Category')
         plt.ylabel('Number of Test Cases')
         plt.tight_layout()
-        plt.savefig('outputs/category_distribution.png')
+        plt.savefig(os.path.join(output_dir, 'category_distribution.png'))
         plt.close()
 
     # 2. Priority distribution
@@ -607,7 +618,7 @@ def visualize_results(test_cases, metrics):
         plt.title('Test Case Distribution by Priority')
         plt.axis('equal')
         plt.tight_layout()
-        plt.savefig('outputs/priority_distribution.png')
+        plt.savefig(os.path.join(output_dir, 'priority_distribution.png'))
         plt.close()
 
     # 3. Coverage
@@ -619,7 +630,7 @@ def visualize_results(test_cases, metrics):
     plt.title('Requirements Coverage')
     plt.text(coverage + 1, 0, f"{coverage:.1f}%", va='center', fontweight='bold')
     plt.tight_layout()
-    plt.savefig('outputs/coverage_chart.png')
+    plt.savefig(os.path.join(output_dir, 'coverage_chart.png'))
     plt.close()
 
 
@@ -627,32 +638,42 @@ def visualize_results(test_cases, metrics):
 # MAIN PIPELINE
 # ===============================
 
-def main_pipeline(file_path):
+def main_pipeline(file_path, output_dir="outputs"):
     print("🚀 Starting Test Case Generation")
     print("=" * 60)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Auto-detect and convert DOCX
+    if file_path.lower().endswith(".docx"):
+        print("📥 DOCX detected. Converting to CSV...")
+        converted_csv = os.path.join(output_dir, "converted_requirements.csv")
+        file_path = convert_docx_to_csv(file_path, converted_csv)   # replace path with CSV
+
     try:
-        processor = RequirementsProcessor()
+        processor = get_processor()
         df = processor.load_requirements(file_path)
     except FileNotFoundError:
-        print(f"❌ Error: Input file not found at '{file_path}'")
-        sys.exit(1)
+        raise ValueError(f"Input file not found at '{file_path}'")
     except Exception as e:
-        print(f"❌ Error loading file: {e}")
-        sys.exit(1)
+        raise ValueError(f"Error loading file: {e}")
 
     df.dropna(subset=['requirement_text'], inplace=True)
     df = df[df['requirement_text'].str.strip() != '']
     if df.empty:
-        print("❌ Error: The input file is empty or contains no valid requirements.")
-        sys.exit(1)
+        raise ValueError("The input file is empty or contains no valid requirements.")
         
     df['processed_text'] = df['requirement_text'].apply(processor.preprocess_text)
     df['entities'] = df['processed_text'].apply(processor.extract_entities)
 
     print(f"✅ Loaded {len(df)} requirements and extracted entities")
+    # The classifier is trained per file on purpose: its labels come from this
+    # file's own keyword rules, so a model shared across a batch would change results.
+    # Fit time is reported separately so batch timings show pure processing time.
+    train_start = time.perf_counter()
     scenario_gen = TestScenarioGenerator()
     training_data = scenario_gen.create_training_data(df)
     scenario_gen.train_model(training_data)
+    train_seconds = time.perf_counter() - train_start
     scenarios = [
         scenario_gen.generate_test_scenarios(row['processed_text'], row['entities']) 
         for _, row in df.iterrows()
@@ -662,7 +683,8 @@ def main_pipeline(file_path):
     test_gen = TestCaseGenerator()
     test_cases = test_gen.generate_test_cases(scenarios)
     metrics = test_gen.calculate_metrics(df)
-    output_file = os.path.join("outputs", "generated_test_cases.csv")
+    metrics['train_seconds'] = train_seconds
+    output_file = os.path.join(output_dir, "generated_test_cases.csv")
     pd.DataFrame(test_cases).to_csv(output_file, index=False)
 
     print("=" * 60)
@@ -676,18 +698,176 @@ def main_pipeline(file_path):
         for cat, count in metrics['category_distribution'].items():
             print(f" - {cat}: {count}")
 
-    visualize_results(test_cases, metrics)
-    print("\n📊 Charts and CSV saved to 'outputs/' folder")
+    visualize_results(test_cases, metrics, output_dir)
+    print(f"\n📊 Charts and CSV saved to '{output_dir}/' folder")
     return output_file, metrics
 
 
+# ===============================
+# BATCH MODE
+# ===============================
+
+def is_glob_pattern(path):
+    """Treat a path as a glob only if it does not exist and contains wildcard characters."""
+    return not os.path.exists(path) and any(c in path for c in '*?[')
+
+
+def is_batch_request(paths):
+    """Batch layout unless the script was called with exactly one explicit file path (as upload.php does)."""
+    return len(paths) > 1 or any(os.path.isdir(p) or is_glob_pattern(p) for p in paths)
+
+
+def collect_input_files(paths):
+    """Expand files, directories and glob patterns into a sorted list of requirement files."""
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        if os.path.isdir(path):
+            candidates = [os.path.join(path, name) for name in os.listdir(path)]
+        elif is_glob_pattern(path):
+            candidates = glob.glob(path)
+        else:
+            files.append(path)   # explicit file: let the pipeline report if it is missing
+            continue
+        files.extend(sorted(
+            c for c in candidates
+            if os.path.isfile(c) and c.lower().endswith(SUPPORTED_EXTENSIONS)
+        ))
+
+    # Drop duplicates while keeping order
+    unique_files = []
+    for f in files:
+        if f not in unique_files:
+            unique_files.append(f)
+    return unique_files
+
+
+def batch_output_dirs(files, output_dir="outputs"):
+    """Give every input file its own output folder named after the file."""
+    dirs = []
+    used = set()
+    for f in files:
+        name = os.path.splitext(os.path.basename(f))[0]
+        candidate = name
+        suffix = 2
+        while candidate in used:
+            candidate = f"{name}_{suffix}"
+            suffix += 1
+        used.add(candidate)
+        dirs.append(os.path.join(output_dir, candidate))
+    return dirs
+
+
+def process_file(file_path, output_dir):
+    """Run the pipeline for one file of a batch and return its summary row."""
+    start = time.perf_counter()
+    row = {
+        'input_file': file_path,
+        'status': 'ok',
+        'requirements': 0,
+        'test_cases': 0,
+        'requirements_coverage': 0.0,
+        'seconds': 0.0,
+        'train_seconds': 0.0,
+        'processing_seconds': 0.0,
+        'output_file': '',
+        'error': ''
+    }
+    try:
+        output_file, metrics = main_pipeline(file_path, output_dir)
+        row['requirements'] = metrics['total_requirements']
+        row['test_cases'] = metrics['total_test_cases']
+        row['requirements_coverage'] = round(metrics['requirements_coverage'], 1)
+        row['output_file'] = output_file
+        row['train_seconds'] = round(metrics['train_seconds'], 2)
+    except Exception as e:
+        print(f"❌ Error processing '{file_path}': {e}")
+        row['status'] = 'failed'
+        row['error'] = str(e)
+    seconds = time.perf_counter() - start
+    row['seconds'] = round(seconds, 2)
+    row['processing_seconds'] = round(seconds - row['train_seconds'], 2)
+    return row
+
+
+def run_batch(files, output_dir="outputs", workers=1):
+    """Process many files in one process (or a worker pool) sharing the loaded NLP model."""
+    out_dirs = batch_output_dirs(files, output_dir)
+
+    # Load spaCy/NLTK once up front. On Linux workers are forked and share it;
+    # elsewhere (Windows, macOS) the platform default start method is kept, since
+    # forking after macOS system frameworks are loaded can crash, and each worker
+    # loads the model once at startup.
+    load_start = time.perf_counter()
+    get_processor()
+    print(f"🧠 NLP model loaded in {time.perf_counter() - load_start:.2f}s")
+
+    if workers > 1 and len(files) > 1:
+        if sys.platform.startswith('linux'):
+            context = multiprocessing.get_context('fork')
+        else:
+            context = None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=get_processor) as pool:
+            rows = list(pool.map(process_file, files, out_dirs))
+    else:
+        rows = [process_file(f, d) for f, d in zip(files, out_dirs)]
+
+    summary_file = os.path.join(output_dir, "batch_summary.csv")
+    pd.DataFrame(rows).to_csv(summary_file, index=False)
+
+    ok_rows = [r for r in rows if r['status'] == 'ok']
+    print("=" * 60)
+    print("📦 BATCH SUMMARY")
+    print("=" * 60)
+    for r in rows:
+        if r['status'] == 'ok':
+            print(f" - {r['input_file']}: {r['test_cases']} test cases, {r['requirements_coverage']:.1f}% coverage ({r['seconds']:.2f}s, {r['train_seconds']:.2f}s training)")
+        else:
+            print(f" - {r['input_file']}: FAILED ({r['error']})")
+    print(f"\nFiles Processed: {len(ok_rows)}/{len(rows)}")
+    print(f"Total Test Cases: {sum(r['test_cases'] for r in ok_rows)}")
+    print(f"Summary File: {summary_file}")
+    return summary_file, rows
+
+
 # ===============================
 # RUN SCRIPT
 # ===============================
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate test cases from requirement files (CSV/XLSX/DOCX).")
+    parser.add_argument("inputs", nargs="+", help="Requirement files, directories or glob patterns")
+    parser.add_argument("--output-dir", default="outputs", help="Folder for generated outputs (default: outputs)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of files to process in parallel in batch mode")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    file_path = input_file
-    output_file, metrics = main_pipeline(file_path)
+    if len(sys.argv) < 2:
+        print("❌ Error: No input file provided.")
+        sys.exit(1)
+
+    args = parse_args()
+    files = collect_input_files(args.inputs)
+    if not files:
+        print("❌ Error: No supported input files (CSV/XLSX/DOCX) found.")
+        sys.exit(1)
+
+    # Batch mode: one output folder per file plus a combined summary
+    if is_batch_request(args.inputs):
+        summary_file, rows = run_batch(files, args.output_dir, args.workers)
+        print("---TEST_CASE_COUNT_DELIMITER---")
+        print(sum(r['test_cases'] for r in rows))
+        sys.exit(0 if all(r['status'] == 'ok' for r in rows) else 1)
+
+    file_path = files[0]
+    try:
+        output_file, metrics = main_pipeline(file_path, args.output_dir)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
     
     # ⭐ ADDED: Print a specific delimiter for PHP to easily find the count ⭐
     print("---TEST_CASE_COUNT_DELIMITER---")